@@ -0,0 +1,24 @@
+import os
+import time
+
+
+# Minimal ERIS model for the tests. Some benchmark names trigger special
+# behaviour: "slow-*" takes a while, "fail" raises and "crash" kills the
+# worker process.
+class Eris:
+    def __init__(self, cpus, ht):
+        self.cpus = cpus
+
+    def benchmarks(self, name):
+        if name.startswith("slow"):
+            time.sleep(0.05)
+        elif name == "fail":
+            raise ValueError("no model for {}".format(name))
+        elif name == "crash":
+            os._exit(1)
+
+        params = {k: (lambda: 0.5) for k in ["memory_heaviness", "avx_heaviness", "branch_heaviness",
+                                             "compute_heaviness", "cache_heaviness", "nomemory_heaviness"]}
+        params["ipt"] = lambda: 1000 / self.cpus
+
+        return params
@@ -0,0 +1,10 @@
+# Minimal hardware model for the tests: power and performance grow with the
+# frequency and the number of cores.
+class Hardware:
+    name = "test"
+    config = {"freq": [1000000, 2000000], "cores": [1, 2], "ht": [0, 1]}
+
+    IPC = staticmethod(lambda **kwargs: 1.0 + 0.2 * kwargs["ht"])
+    P_PKG = staticmethod(lambda **kwargs: kwargs["freq"] / 1e6 * kwargs["cpus"])
+    P_Cores = staticmethod(lambda **kwargs: 1.0)
+    P_Ram = staticmethod(lambda **kwargs: 1.0)
@@ -0,0 +1,4 @@
+def paretoOptimize(items, keys):
+    # Only minimal power and maximal T/s are supported
+    return [i for i in items
+            if not any(o["power"] <= i["power"] and o["tps"] >= i["tps"] and o != i for o in items)]
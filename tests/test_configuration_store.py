@@ -0,0 +1,102 @@
+import time
+from os.path import dirname, join
+
+import pytest
+
+from util.configurations import ConfigurationStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    # The worker processes are started with the current sys.path, so they
+    # use the test models
+    monkeypatch.syspath_prepend(join(dirname(__file__), "models"))
+
+    store = ConfigurationStore(model="test", max_workers=1)
+    yield store
+    store.shutdown()
+
+
+def wait_for(condition, timeout=60):
+    end = time.time() + timeout
+    while not condition():
+        assert time.time() < end, "timed out"
+        time.sleep(0.05)
+
+
+def generated(messages):
+    return [m.split()[-1] for m in messages if m.startswith("Generating")]
+
+
+def test_ready(store):
+    assert store.ready("b1") is None
+
+    store.request("b1")
+    wait_for(lambda: store.ready("b1") is not None)
+
+    table = store.ready("b1")
+    assert len(table) == 8
+    assert 0 < len(table.pareto) < len(table)
+
+
+def test_queue_order(store):
+    messages = []
+    for b in ("slow-1", "slow-2", "slow-3", "slow-4"):
+        store.request(b, messages.append)
+
+    # slow-1 is already running, the others are queued
+    store.prioritize("slow-4", messages.append)
+    store.prioritize("slow-3", messages.append)
+
+    wait_for(lambda: all(store.ready(b) is not None for b in ("slow-1", "slow-2", "slow-3", "slow-4")))
+    assert generated(messages) == ["slow-1", "slow-3", "slow-4", "slow-2"]
+
+
+def test_requests_are_not_repeated(store):
+    messages = []
+    store.request("b1", messages.append)
+    store.request("b1", messages.append)
+    store.prioritize("b1", messages.append)
+    wait_for(lambda: store.ready("b1") is not None)
+
+    store.request("b1", messages.append)
+    assert generated(messages) == ["b1"]
+    assert len([m for m in messages if m.startswith("Generated ")]) == 1
+
+
+def test_failure(store):
+    messages = []
+    store.request("fail", messages.append)
+    store.request("b1", messages.append)
+
+    wait_for(lambda: store.ready("b1") is not None)
+    assert store.ready("fail") is None
+    assert any(m.startswith("Failed to generate configurations for fail") for m in messages)
+
+
+def test_crashing_worker(store):
+    messages = []
+    store.request("crash", messages.append)
+    store.request("b1", messages.append)
+
+    # The broken pool is replaced and the other benchmarks are still generated
+    wait_for(lambda: store.ready("b1") is not None)
+    wait_for(lambda: any(m.startswith("Failed to generate configurations for crash") for m in messages))
+
+    store.prioritize("b2", messages.append)
+    wait_for(lambda: store.ready("b2") is not None)
+    assert store.ready("crash") is None
+
+
+def test_shutdown(store):
+    messages = []
+    store.request("slow-1", messages.append)
+    store.request("slow-2", messages.append)
+    store.shutdown()
+
+    store.request("b1", messages.append)
+    time.sleep(0.5)
+
+    assert generated(messages) == ["slow-1"]
+    assert store.ready("slow-2") is None
+    assert store.ready("b1") is None
@@ -0,0 +1,98 @@
+import math
+
+import pytest
+
+from util.configurations import Config, ConfigTable
+
+
+def config(freq, cores, power, tps, ht=False, uncore=None):
+    return Config(freq=freq, cores=cores, ht=ht, cpus=cores * (ht + 1), ipc=1, power=power, tps=tps,
+                  epr=power / tps, uncore=uncore)
+
+
+FREQS = [1000000, 2000000, 3000000]
+UNCORES = [None, 1000000, 2000000]
+
+SLOW = config(1000000, 1, 10, 100, uncore=1000000)
+MEDIUM = config(2000000, 2, 20, 400, uncore=2000000)
+FAST = config(3000000, 4, 60, 800)
+WASTEFUL = config(3000000, 2, 50, 300)
+
+
+@pytest.fixture
+def table():
+    return ConfigTable([FAST, WASTEFUL, SLOW, MEDIUM], [MEDIUM, FAST, SLOW], FREQS, UNCORES)
+
+
+def test_config_identity():
+    same = SLOW._replace(power=99, tps=1, epr=1, ipc=2)
+
+    assert same == SLOW
+    assert not same != SLOW
+    assert hash(same) == hash(SLOW)
+    assert SLOW != SLOW._replace(uncore=2000000)
+    assert len({SLOW, same, MEDIUM}) == 2
+
+
+def test_config_compares_with_other_types():
+    # Plain tuples compare by value, everything else is different
+    assert SLOW == tuple(SLOW)
+    assert SLOW != tuple(SLOW._replace(power=99))
+    assert SLOW != "config"
+    assert SLOW != None  # noqa: E711
+
+
+def test_ids(table):
+    assert len(table) == 4
+    assert [table.id_of(c) for c in (FAST, WASTEFUL, SLOW, MEDIUM)] == [0, 1, 2, 3]
+    assert table.id_of(SLOW._replace(power=1)) == 2
+    assert table.id_of(config(1000000, 8, 1, 1)) is None
+
+
+def test_pareto_is_ordered_by_power(table):
+    assert table.pareto == [2, 3, 0]
+    assert [table.configs[i] for i in table.pareto] == [SLOW, MEDIUM, FAST]
+    assert table.pareto_points == [table.points[i] for i in table.pareto]
+
+
+def test_columns(table):
+    assert list(table.power) == [60, 50, 10, 20]
+    assert list(table.tps) == [800, 300, 100, 400]
+    assert list(table.ee) == pytest.approx([800 / 60, 6, 10, 20])
+    assert list(table.freq_level) == [100, 100, 0, 50]
+
+
+def test_uncore_levels(table):
+    levels = list(table.uncore_level)
+
+    assert math.isnan(levels[0])
+    assert levels[2:] == [0, 100]
+
+
+def test_relative_to_pareto(table):
+    assert list(table.rel_perf) == pytest.approx([100, 37.5, 12.5, 50])
+    assert list(table.rel_ee) == pytest.approx([800 / 60 / 20 * 100, 30, 50, 100])
+
+
+def test_points_are_normalized_over_all_configurations(table):
+    assert table.points[0] == pytest.approx([100, 100])
+    assert table.points[2] == pytest.approx([0, 0])
+    assert table.points[3] == pytest.approx([300 / 700 * 100, 10 / 50 * 100])
+
+
+def test_single_configuration():
+    table = ConfigTable([SLOW], [SLOW], FREQS, [None])
+
+    assert table.pareto == [0]
+    # Without a range, the values are measured from 0
+    assert table.points == [[100, 100]]
+    assert math.isnan(table.uncore_level[0])
+    assert table.rel_perf[0] == 100
+
+
+def test_empty():
+    table = ConfigTable([], [], FREQS, UNCORES)
+
+    assert len(table) == 0
+    assert table.pareto == []
+    assert table.points == []
@@ -0,0 +1,106 @@
+import logging
+from collections import namedtuple
+
+from util.counters import CounterCursor
+
+Sample = namedtuple("Sample", ["timestamp", "value"])
+
+
+class SharedMonitor:
+    # Hands out its own sample list
+    def __init__(self):
+        self.samples = []
+
+    def add(self, *values):
+        self.samples.extend(Sample(len(self.samples), v) for v in values)
+
+    def values(self, update):
+        return self.samples
+
+
+class CopyingMonitor(SharedMonitor):
+    def values(self, update):
+        return list(self.samples)
+
+
+def test_refresh_returns_only_new_samples():
+    monitor = SharedMonitor()
+    cursor = CounterCursor(monitor)
+    assert cursor.latest() is None
+    assert cursor.latest_value(0) == 0
+
+    monitor.add(1, 2, 3)
+    assert [s.value for s in cursor.refresh()] == [1, 2, 3]
+    assert cursor.refresh() == []
+
+    monitor.add(4)
+    assert [s.value for s in cursor.refresh()] == [4]
+    assert cursor.latest_value() == 4
+    assert cursor.count == 4
+
+
+def test_monitor_is_not_modified():
+    monitor = SharedMonitor()
+    cursor = CounterCursor(monitor)
+
+    monitor.add(1, 2, 3)
+    cursor.refresh()
+    monitor.add(4)
+    cursor.refresh()
+
+    assert [s.value for s in monitor.samples] == [1, 2, 3, 4]
+
+
+def test_monitor_reset():
+    monitor = SharedMonitor()
+    cursor = CounterCursor(monitor)
+
+    monitor.add(1, 2, 3)
+    cursor.refresh()
+
+    monitor.samples = []
+    monitor.add(5)
+    assert [s.value for s in cursor.refresh()] == [5]
+    assert cursor.count == 4
+
+
+def test_since_is_bounded_by_the_history():
+    monitor = SharedMonitor()
+    cursor = CounterCursor(monitor, history=3)
+
+    monitor.add(1, 2)
+    cursor.refresh()
+    count = cursor.count
+
+    monitor.add(3, 4, 5, 6)
+    cursor.refresh()
+
+    assert [s.value for s in cursor.since(count)] == [4, 5, 6]
+    assert [s.value for s in cursor.since(cursor.count - 1)] == [6]
+    assert cursor.since(cursor.count) == []
+
+
+def test_copying_monitor_is_logged_once():
+    messages = []
+    monitor = CopyingMonitor()
+    cursor = CounterCursor(monitor, name="Tasks.Started", log=lambda m, l: messages.append((m, l)))
+
+    monitor.add(1, 2)
+    assert [s.value for s in cursor.refresh()] == [1, 2]
+    monitor.add(3)
+    assert [s.value for s in cursor.refresh()] == [3]
+
+    assert len(messages) == 1
+    assert "Tasks.Started" in messages[0][0]
+    assert messages[0][1] == logging.WARNING
+
+
+def test_shared_monitor_is_not_logged():
+    messages = []
+    monitor = SharedMonitor()
+    cursor = CounterCursor(monitor, log=lambda m, l: messages.append(m))
+
+    monitor.add(1)
+    cursor.refresh()
+
+    assert messages == []
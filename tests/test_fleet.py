@@ -0,0 +1,69 @@
+from util.fleet import PowerNode, distribute_power_budget
+
+# (power, T/s) of the pareto optimal configurations, ordered by power
+EFFICIENT = [(10, 100), (20, 300), (40, 500)]
+HUNGRY = [(10, 100), (30, 200), (60, 300)]
+
+
+def test_everything_fits():
+    nodes = {"a": PowerNode(EFFICIENT, None, None), "b": PowerNode(HUNGRY, None, None)}
+
+    assert distribute_power_budget(nodes, 1000) == ({"a": 40, "b": 60}, 1000)
+
+
+def test_best_gain_per_watt_first():
+    nodes = {"a": PowerNode(EFFICIENT, None, None), "b": PowerNode(HUNGRY, None, None)}
+
+    # a gains 20 T/s per W on its first upgrade, b only 5
+    caps, _ = distribute_power_budget(nodes, 30)
+    assert caps == {"a": 20, "b": 10}
+
+    caps, _ = distribute_power_budget(nodes, 70)
+    assert caps == {"a": 40, "b": 30}
+
+
+def test_demand_is_honored_first():
+    # a already meets its demand, so b is upgraded first although a would
+    # gain more per W
+    nodes = {"a": PowerNode(EFFICIENT, 100, None), "b": PowerNode(HUNGRY, 200, None)}
+
+    caps, _ = distribute_power_budget(nodes, 40)
+    assert caps == {"a": 10, "b": 30}
+
+    # What is left afterwards goes to the best gain again
+    caps, _ = distribute_power_budget(nodes, 50)
+    assert caps == {"a": 20, "b": 30}
+
+
+def test_budget_is_not_exceeded():
+    nodes = {"a": PowerNode(EFFICIENT, 1000, None), "b": PowerNode(HUNGRY, 1000, None)}
+
+    for budget in range(20, 110, 5):
+        caps, available = distribute_power_budget(nodes, budget)
+        assert available == budget
+        assert sum(caps.values()) <= budget
+
+
+def test_budget_below_minimum():
+    nodes = {"a": PowerNode(EFFICIENT, None, None), "b": PowerNode(HUNGRY, None, None)}
+
+    # Every node gets at least its most frugal configuration
+    caps, available = distribute_power_budget(nodes, 5)
+    assert caps == {"a": 10, "b": 10}
+    assert sum(caps.values()) > available
+
+
+def test_nodes_without_models_are_reserved():
+    nodes = {
+        "a": PowerNode(EFFICIENT, None, None),
+        "loading": PowerNode(None, 500, 25),
+        "unknown": PowerNode(None, None, None),
+    }
+
+    caps, available = distribute_power_budget(nodes, 45)
+    assert caps == {"a": 20}
+    assert available == 20
+
+
+def test_no_nodes():
+    assert distribute_power_budget({}, 100) == ({}, 100)
@@ -0,0 +1,84 @@
+import pytest
+
+from util.forecast import HoltForecaster, LinearForecaster, create_forecaster
+
+
+def test_create_forecaster():
+    assert isinstance(create_forecaster("holt"), HoltForecaster)
+    assert isinstance(create_forecaster("linear"), LinearForecaster)
+    assert create_forecaster("none") is None
+
+
+@pytest.mark.parametrize("forecaster", [HoltForecaster(), LinearForecaster()])
+def test_no_samples(forecaster):
+    assert forecaster.predict(1) is None
+    assert forecaster.mape is None
+
+
+@pytest.mark.parametrize("forecaster", [HoltForecaster(alpha=0.8, beta=0.8), LinearForecaster(window=5)])
+def test_linear_ramp(forecaster):
+    for t in range(20):
+        forecaster.update(t, 100 + 10 * t)
+
+    assert forecaster.predict(2) == pytest.approx(100 + 10 * 21, rel=0.01)
+
+
+@pytest.mark.parametrize("forecaster", [HoltForecaster(), LinearForecaster()])
+def test_constant_demand(forecaster):
+    for t in range(10):
+        forecaster.update(t, 500)
+
+    assert forecaster.predict(5) == pytest.approx(500)
+
+
+@pytest.mark.parametrize("forecaster", [HoltForecaster(), LinearForecaster()])
+def test_never_negative(forecaster):
+    for t in range(10):
+        forecaster.update(t, 100 - 10 * t)
+
+    assert forecaster.predict(10) == 0
+
+
+def test_holt_irregular_intervals():
+    forecaster = HoltForecaster(alpha=1, beta=1)
+    forecaster.update(0, 0)
+    forecaster.update(2, 20)
+    forecaster.update(3, 30)
+
+    # The trend is kept per second
+    assert forecaster.predict(2) == pytest.approx(50)
+
+
+def test_linear_window():
+    forecaster = LinearForecaster(window=3)
+    for t, v in enumerate([1000, 0, 10, 20, 30]):
+        forecaster.update(t, v)
+
+    # The first samples dropped out of the window
+    assert forecaster.predict(1) == pytest.approx(40)
+
+
+def test_mape():
+    forecaster = LinearForecaster(error_weight=0.5)
+    forecaster.update(0, 100)
+    assert forecaster.predict(1) == 100
+
+    # The prediction for t=1 is scored against the first sample at or after it
+    forecaster.update(1, 200)
+    assert forecaster.scored == 1
+    assert forecaster.mape == pytest.approx(0.5)
+
+    forecaster.predict(1)
+    forecaster.update(2, 300)
+    assert forecaster.scored == 2
+    assert forecaster.mape == pytest.approx(0.5 * 0.5 + 0.5 * 0)
+
+
+def test_mape_ignores_zero_demand():
+    forecaster = LinearForecaster()
+    forecaster.update(0, 100)
+    forecaster.predict(1)
+    forecaster.update(1, 0)
+
+    assert forecaster.scored == 0
+    assert forecaster.mape is None
@@ -0,0 +1,116 @@
+import io
+import logging
+import time
+
+from util.log import LogRing
+
+
+def messages(entries):
+    return [e.message for e in entries]
+
+
+def fill(ring, count, level=logging.INFO):
+    for i in range(1, count + 1):
+        ring.log("message {}".format(i), level)
+
+
+def test_tail():
+    ring = LogRing(capacity=5, rate_limit=0)
+    fill(ring, 3)
+
+    assert messages(ring.tail(2)) == ["message 2", "message 3"]
+    assert messages(ring.tail(10)) == ["message 1", "message 2", "message 3"]
+
+
+def test_ring_overwrites_oldest_entries():
+    ring = LogRing(capacity=5, rate_limit=0)
+    fill(ring, 12)
+
+    assert ring.seq == 12
+    assert [e.seq for e in ring.tail(10)] == [8, 9, 10, 11, 12]
+
+
+def test_since_pages_from_the_oldest_entry():
+    ring = LogRing(capacity=5, rate_limit=0)
+    fill(ring, 12)
+
+    # Entries 1-7 are gone, paging continues with the oldest retained one
+    entries, cursor = ring.since(0, 3)
+    assert [e.seq for e in entries] == [8, 9, 10]
+    assert cursor == 10
+
+    entries, cursor = ring.since(cursor, 3)
+    assert [e.seq for e in entries] == [11, 12]
+    assert cursor == 12
+
+    entries, cursor = ring.since(cursor, 3)
+    assert entries == []
+    assert cursor == 12
+
+
+def test_since_skips_filtered_entries():
+    ring = LogRing(capacity=10, level=logging.DEBUG, rate_limit=0)
+    ring.log("debug 1", logging.DEBUG)
+    ring.log("warning 1", logging.WARNING)
+    ring.log("debug 2", logging.DEBUG)
+    ring.log("debug 3", logging.DEBUG)
+
+    entries, cursor = ring.since(0, 10, logging.WARNING)
+    assert messages(entries) == ["warning 1"]
+    assert cursor == 4
+
+    entries, cursor = ring.since(0, 1, logging.WARNING)
+    assert messages(entries) == ["warning 1"]
+    assert cursor == 2
+
+
+def test_level():
+    ring = LogRing(level=logging.WARNING, rate_limit=0)
+    ring.log("info", logging.INFO)
+    ring.log("error", logging.ERROR)
+
+    assert messages(ring.tail(10)) == ["error"]
+
+
+def test_rate_limit():
+    ring = LogRing(rate_limit=0.2)
+    ring.log("same", key="s")
+    ring.log("same", key="s")
+    ring.log("other", key="k")
+    ring.log("another", key="k")
+
+    assert messages(ring.tail(10)) == ["same", "other"]
+
+    # Once the interval is over, the suppressed repeats are reported
+    time.sleep(0.25)
+    ring.log("same", key="s")
+    assert messages(ring.tail(1)) == ["same (1 similar messages suppressed)"]
+
+
+def test_no_rate_limit_without_key():
+    ring = LogRing(rate_limit=10)
+    ring.log("same")
+    ring.log("same")
+
+    assert messages(ring.tail(10)) == ["same", "same"]
+
+
+def test_stream_output():
+    stream = io.StringIO()
+    ring = LogRing(rate_limit=0, stream=stream)
+    fill(ring, 3)
+    ring.close()
+
+    lines = stream.getvalue().splitlines()
+    assert len(lines) == 3
+    assert lines[0].endswith("INFO    message 1")
+
+
+def test_file_output(tmp_path):
+    path = tmp_path / "log"
+    ring = LogRing(rate_limit=0, path=str(path))
+    fill(ring, 2, logging.ERROR)
+    ring.close()
+
+    assert [l.split(None, 2)[1:] for l in path.read_text().splitlines()] == \
+            [["ERROR", "message 1"], ["ERROR", "message 2"]]
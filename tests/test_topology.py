@@ -0,0 +1,116 @@
+import itertools
+
+import pytest
+
+from util.topology import CPUTopology, Placement, parse_cpulist
+
+
+def make_topology(path, packages=2, cores=2, threads=2, cache=True, nodes=None):
+    # CPUs are numbered like Linux does: first the first thread of every
+    # core, then the second ones. Every package has its own last level cache
+    # and by default its own NUMA node.
+    if nodes is None:
+        nodes = list(range(packages))
+
+    per_thread = packages * cores
+    for t in range(threads):
+        for p in range(packages):
+            for c in range(cores):
+                cpu = t * per_thread + p * cores + c
+                siblings = [s * per_thread + p * cores + c for s in range(threads)]
+
+                d = path / "cpu{}".format(cpu)
+                (d / "topology").mkdir(parents=True)
+                (d / "topology" / "physical_package_id").write_text("{}\n".format(p))
+                (d / "topology" / "core_id").write_text("{}\n".format(c))
+                (d / "topology" / "thread_siblings_list").write_text(",".join(map(str, siblings)) + "\n")
+                (d / "node{}".format(nodes[p])).mkdir()
+
+                if cache:
+                    llc = [s * per_thread + p * cores + i for s in range(threads) for i in range(cores)]
+                    for i, shared in enumerate([siblings, siblings, llc]):
+                        (d / "cache" / "index{}".format(i)).mkdir(parents=True)
+                        (d / "cache" / "index{}".format(i) / "shared_cpu_list").write_text(
+                                ",".join(map(str, shared)) + "\n")
+
+    # Entries which are not CPUs are ignored
+    (path / "cpufreq").mkdir()
+    (path / "online").write_text("0-{}\n".format(packages * cores * threads - 1))
+
+    return CPUTopology(str(path))
+
+
+def clock():
+    return itertools.count().__next__
+
+
+def test_parse_cpulist():
+    assert parse_cpulist("0-3,8,10-11\n") == [0, 1, 2, 3, 8, 10, 11]
+    assert parse_cpulist("") == []
+
+
+def test_topology(tmp_path):
+    topo = make_topology(tmp_path)
+
+    assert sorted(topo.cpus) == list(range(8))
+    assert topo.cpus[5] == CPUTopology.CPU(5, 0, 1, 0, 0, (1, 5))
+    assert topo.cpus[3] == CPUTopology.CPU(3, 1, 1, 1, 2, (3, 7))
+    assert topo.primary(6) == 2
+    assert topo.cores() == [0, 1, 2, 3]
+    assert topo.threads(1) == [1, 5]
+
+
+def test_topology_without_cache_information(tmp_path):
+    topo = make_topology(tmp_path, cache=False)
+
+    assert topo.cpus[3].llc == ("package", 1)
+
+
+def test_no_topology(tmp_path):
+    with pytest.raises(ValueError):
+        CPUTopology(str(tmp_path / "missing"))
+    with pytest.raises(ValueError):
+        CPUTopology(str(tmp_path))
+
+
+def test_placement_packs_cores(tmp_path):
+    placement = Placement(make_topology(tmp_path), clock=clock())
+
+    assert placement.select(1, False) == [0]
+    # The second core shares the last level cache with the first one
+    assert placement.select(2, False) == [0, 1]
+    assert placement.select(2, True) == [0, 1, 4, 5]
+    assert placement.select(3, False) == [0, 1, 2]
+    assert placement.select(8, False) == [0, 1, 2, 3]
+
+
+def test_placement_is_incremental(tmp_path):
+    placement = Placement(make_topology(tmp_path, packages=2, cores=4, threads=1), clock=clock())
+
+    # Shrinking removes the cores from the least populated domain first
+    placement.select(6, False)
+    assert placement.select(4, False) == [0, 1, 2, 3]
+
+    # Growing again stays close to the active cores
+    assert placement.select(5, False) == [0, 1, 2, 3, 4]
+
+
+def test_placement_prefers_warm_cores(tmp_path):
+    # Three packages with one core each, the last two share a NUMA node
+    placement = Placement(make_topology(tmp_path, packages=3, cores=1, threads=1, nodes=[0, 1, 1]),
+                          clock=clock())
+
+    placement.select(3, False)
+    assert placement.select(2, False) == [1, 2]
+    placement.select(0, False)
+
+    # Core 1 ran last, core 2 before it
+    assert placement.select(1, False) == [1]
+    assert placement.select(2, False) == [1, 2]
+
+
+def test_placement_restricted_cpus(tmp_path):
+    placement = Placement(make_topology(tmp_path), cpus=[2, 3, 6], clock=clock())
+
+    assert placement.select(1, True) == [2, 6]
+    assert placement.select(2, True) == [2, 3, 6]
@@ -0,0 +1,92 @@
+import pytest
+
+from util.trace import HEADER, Events, TraceError, TraceWriter, read_trace, trace_files
+
+# Reading traces back needs NumPy
+np = pytest.importorskip("numpy")
+
+
+def write_records(writer, count, start=0):
+    for i in range(start, start + count):
+        writer.write(Events.SAMPLE if i % 2 == 0 else Events.DECISION, float(i),
+                     started=i * 10, power=i / 2, freq=1200000 + i, uncore=None if i % 2 else 1800000,
+                     cores=i % 8, ht=bool(i % 2))
+
+
+def test_round_trip(tmp_path):
+    path = str(tmp_path / "trace")
+    with TraceWriter(path, capacity=16) as writer:
+        write_records(writer, 10)
+
+    records = np.concatenate(list(read_trace(path)))
+
+    assert len(records) == 10
+    assert list(records["timestamp"]) == [float(i) for i in range(10)]
+    assert list(records["started"]) == [i * 10 for i in range(10)]
+    assert list(records["power"]) == [i / 2 for i in range(10)]
+    assert list(records["freq"]) == [1200000 + i for i in range(10)]
+    assert list(records["uncore"]) == [0 if i % 2 else 1800000 for i in range(10)]
+    assert list(records["event"]) == [int(Events.SAMPLE), int(Events.DECISION)] * 5
+    assert np.isnan(records["latency"]).all()
+
+
+def test_rotation(tmp_path):
+    path = str(tmp_path / "trace")
+    with TraceWriter(path, capacity=4, files=2) as writer:
+        write_records(writer, 14)
+
+    # 14 records in files of 4: the two full files before the current one
+    # are kept, the oldest one is dropped
+    assert trace_files(path) == [path + ".2", path + ".1", path]
+
+    timestamps = [t for chunk in read_trace(path) for t in chunk["timestamp"]]
+    assert timestamps == [float(i) for i in range(4, 14)]
+
+
+def test_existing_trace(tmp_path):
+    path = str(tmp_path / "trace")
+    with TraceWriter(path, capacity=8) as writer:
+        write_records(writer, 3)
+
+    # A restart keeps the previous trace as the newest rotated file
+    with TraceWriter(path, capacity=8) as writer:
+        write_records(writer, 2, start=3)
+
+    assert trace_files(path) == [path + ".1", path]
+
+    timestamps = [t for chunk in read_trace(path) for t in chunk["timestamp"]]
+    assert timestamps == [float(i) for i in range(5)]
+
+
+def test_chunks(tmp_path):
+    path = str(tmp_path / "trace")
+    with TraceWriter(path, capacity=16) as writer:
+        write_records(writer, 10)
+
+    assert [len(c) for c in read_trace(path, chunk=4)] == [4, 4, 2]
+
+
+def test_header_count(tmp_path):
+    path = str(tmp_path / "trace")
+    writer = TraceWriter(path, capacity=8)
+    write_records(writer, 3)
+    writer.close()
+
+    with open(path, "rb") as f:
+        assert HEADER.unpack(f.read(HEADER.size))[-1] == 3
+
+
+def test_write_after_close(tmp_path):
+    writer = TraceWriter(str(tmp_path / "trace"), capacity=8)
+    writer.close()
+
+    with pytest.raises(TraceError):
+        write_records(writer, 1)
+
+
+def test_incompatible_file(tmp_path):
+    path = tmp_path / "trace"
+    path.write_bytes(b"\0" * 128)
+
+    with pytest.raises(TraceError):
+        list(read_trace(str(path)))
@@ -0,0 +1,111 @@
+import struct
+
+import pytest
+
+from util.uncore import FakeUncore, MSRUncore, SysfsUncore, create_uncore_backend
+
+
+def make_sysfs(path, domains, min_khz=800000, max_khz=2400000):
+    for d in domains:
+        p = path / d
+        p.mkdir(parents=True)
+        (p / "min_freq_khz").write_text("{}\n".format(min_khz))
+        (p / "max_freq_khz").write_text("{}\n".format(max_khz))
+
+    return path
+
+
+def test_fake_uncore_records_frequencies():
+    uncore = FakeUncore(khz=1200000)
+    assert uncore.frequency() == 1200000
+
+    uncore.set_frequency(1800000)
+    uncore.set_frequency(1000000)
+
+    assert uncore.frequency() == 1000000
+    assert uncore.history == [1800000, 1000000]
+
+
+def test_sysfs_uncore_sets_all_domains(tmp_path):
+    base = make_sysfs(tmp_path, ["package_00_die_00", "package_01_die_00"])
+    uncore = SysfsUncore(str(base))
+
+    for khz in (1600000, 2800000, 800000):
+        uncore.set_frequency(khz)
+
+        for d in ("package_00_die_00", "package_01_die_00"):
+            assert int((base / d / "min_freq_khz").read_text()) == khz
+            assert int((base / d / "max_freq_khz").read_text()) == khz
+
+    # Without current_freq_khz the maximum is reported
+    assert uncore.frequency() == 800000
+
+
+def test_sysfs_uncore_reports_current_frequency(tmp_path):
+    base = make_sysfs(tmp_path, ["package_00_die_00", "package_01_die_00"])
+    (base / "package_00_die_00" / "current_freq_khz").write_text("1000000\n")
+    (base / "package_01_die_00" / "current_freq_khz").write_text("2000000\n")
+
+    assert SysfsUncore(str(base)).frequency() == 1500000
+
+
+def test_sysfs_uncore_without_driver(tmp_path):
+    with pytest.raises(ValueError):
+        SysfsUncore(str(tmp_path))
+
+
+def make_msr(path, packages, msr, value):
+    # In a plain file the 8 byte registers at neighbouring offsets overlap,
+    # so only one register is faked at a time.
+    cpu_path = path / "cpu"
+    msr_path = path / "dev"
+    for cpu, pkg in enumerate(packages):
+        topo = cpu_path / "cpu{}".format(cpu) / "topology"
+        topo.mkdir(parents=True)
+        (topo / "physical_package_id").write_text("{}\n".format(pkg))
+
+        d = msr_path / str(cpu)
+        d.mkdir(parents=True)
+        with open(d / "msr", "wb") as f:
+            f.seek(msr)
+            f.write(struct.pack("<Q", value))
+
+    return str(cpu_path), str(msr_path)
+
+
+def read_msr(msr_path, cpu, msr):
+    with open("{}/{}/msr".format(msr_path, cpu), "rb") as f:
+        f.seek(msr)
+        return struct.unpack("<Q", f.read(8))[0]
+
+
+def test_msr_uncore_sets_ratio_limits(tmp_path):
+    initial = 0xff0000 | (8 << 8) | 24
+    cpu_path, msr_path = make_msr(tmp_path, [0, 0, 1, 1], MSRUncore.UNCORE_RATIO_LIMIT, initial)
+
+    MSRUncore(cpu_path, msr_path).set_frequency(1800000)
+
+    # Only the first CPU of every package is written and the other bits of
+    # the register are kept
+    expected = 0xff0000 | (18 << 8) | 18
+    assert [read_msr(msr_path, cpu, MSRUncore.UNCORE_RATIO_LIMIT) for cpu in range(4)] == \
+            [expected, initial, expected, initial]
+
+
+def test_msr_uncore_frequency(tmp_path):
+    cpu_path, msr_path = make_msr(tmp_path, [0, 1], MSRUncore.UNCORE_PERF_STATUS, 0x100 | 20)
+
+    assert MSRUncore(cpu_path, msr_path).frequency() == 2000000
+
+
+def test_msr_uncore_without_msr_module(tmp_path):
+    (tmp_path / "cpu" / "cpu0" / "topology").mkdir(parents=True)
+    (tmp_path / "cpu" / "cpu0" / "topology" / "physical_package_id").write_text("0\n")
+
+    with pytest.raises(ValueError):
+        MSRUncore(str(tmp_path / "cpu"), str(tmp_path / "dev"))
+
+
+def test_create_uncore_backend():
+    assert create_uncore_backend("none") is None
+    assert isinstance(create_uncore_backend("fake"), FakeUncore)
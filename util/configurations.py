@@ -0,0 +1,324 @@
+from array import array
+from collections import namedtuple
+from concurrent.futures import CancelledError, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from functools import partial
+from threading import RLock
+import multiprocessing
+import os
+
+
+class Config(namedtuple("Config", ["freq", "cores", "ht", "cpus", "ipc", "power", "tps", "epr", "uncore"],
+                        defaults=(None,))):
+    __slots__ = ()
+
+    def __eq__(self, other):
+        if not isinstance(other, Config):
+            return NotImplemented
+
+        return self.key == other.key
+
+    def __ne__(self, other):
+        if not isinstance(other, Config):
+            return NotImplemented
+
+        return self.key != other.key
+
+    def __hash__(self):
+        return hash(self.key)
+
+    @property
+    def key(self):
+        # The settings which identify a configuration, the rest is estimated
+        return (self.freq, self.cores, self.ht, self.uncore)
+
+
+def _level(value, low, high):
+    if value is None or low is None:
+        return float("nan")
+    if high == low:
+        return 100.0
+
+    return (value - low) / (high - low) * 100
+
+
+class ConfigTable:
+    """
+    All configurations of a benchmark with stable integer IDs. Everything
+    derived from the configurations, i.e. the efficiency, the values relative
+    to the pareto optimal configurations and the normalized coordinates for
+    the configuration plot, is computed once on creation and stored column
+    wise. The IDs of the pareto optimal configurations are ordered by power.
+    """
+    def __init__(self, configs, pareto, freqs, uncores):
+        self.configs = list(configs)
+        self._ids = {c: i for i, c in enumerate(self.configs)}
+
+        self.power = array("d", [c.power for c in self.configs])
+        self.tps = array("d", [c.tps for c in self.configs])
+        self.ee = array("d", [1/c.epr for c in self.configs])
+
+        self.pareto = sorted((self._ids[c] for c in pareto), key=lambda i: (self.power[i], self.tps[i]))
+
+        min_freq, max_freq = min(freqs), max(freqs)
+        self.freq_level = array("d", [_level(c.freq, min_freq, max_freq) for c in self.configs])
+
+        uncores = [u for u in uncores if u is not None]
+        min_uncore, max_uncore = (min(uncores), max(uncores)) if uncores else (None, None)
+        self.uncore_level = array("d", [_level(c.uncore, min_uncore, max_uncore) for c in self.configs])
+
+        # Performance and efficiency relative to the best pareto optimal
+        # configuration
+        max_tps = max((self.tps[i] for i in self.pareto), default=0) or 1
+        max_ee = max((self.ee[i] for i in self.pareto), default=0) or 1
+        self.rel_perf = array("d", [t / max_tps * 100 for t in self.tps])
+        self.rel_ee = array("d", [e / max_ee * 100 for e in self.ee])
+
+        # Coordinates in the configuration plot, normalized over all
+        # configurations
+        self.norm_tps = array("d", self._normalize(self.tps))
+        self.norm_power = array("d", self._normalize(self.power))
+
+        self.points = [[self.norm_tps[i], self.norm_power[i]] for i in range(len(self.configs))]
+        self.pareto_points = [self.points[i] for i in self.pareto]
+
+    @staticmethod
+    def _normalize(values):
+        if len(values) == 0:
+            return []
+
+        high, low = max(values), min(values)
+        if high == low:
+            low = 0
+        if high == low:
+            return [0.0 for v in values]
+
+        return [(v - low) / (high - low) * 100 for v in values]
+
+    def __len__(self):
+        return len(self.configs)
+
+    def id_of(self, config):
+        """
+        The ID of the given configuration or None if it is not in the table.
+        """
+        return self._ids.get(config)
+
+
+def build_table(configs, pareto=None):
+    """
+    Create the configuration table for the current hardware model.
+    """
+    from hardware_model import Hardware
+
+    return ConfigTable(configs, configs if pareto is None else pareto,
+                       Hardware.config["freq"], uncore_frequencies())
+
+
+def hardware_model_name():
+    from hardware_model import Hardware
+
+    return getattr(Hardware, "name", Hardware.__module__)
+
+
+def uncore_frequencies():
+    """
+    The uncore frequencies of the configuration grid or [None] if the hardware
+    model has no uncore dimension.
+    """
+    from hardware_model import Hardware
+
+    return list(Hardware.config.get("uncore", [None]))
+
+
+def generate_configurations(bench_name):
+    """
+    Evaluate the ERIS and hardware models for every point of the configuration
+    grid and reduce the result to the pareto optimal configurations.
+    """
+    from eris_model import Eris
+    from hardware_model import Hardware
+    from pareto import paretoOptimize
+
+    # Hardware models without an uncore dimension are evaluated at the uncore
+    # frequency the hardware chooses by itself.
+    uncores = uncore_frequencies()
+
+    # Generate all possible configurations based on the models
+    all_configurations = []
+    for freq in Hardware.config['freq']:
+        for uncore in uncores:
+            # Only pass the uncore frequency to models which know about it
+            u_args = {} if uncore is None else {"uncore" : uncore}
+
+            for cores in Hardware.config['cores']:
+                for ht in Hardware.config['ht']:
+                    cpus = (ht+1)*cores
+                    params = Eris(cpus, ht).benchmarks(bench_name)
+                    ipc = Hardware.IPC(
+                            memory_heaviness=params["memory_heaviness"](),avx_heaviness=params["avx_heaviness"](), branch_heaviness=params["branch_heaviness"](),
+                            compute_heaviness=params["compute_heaviness"](),cache_heaviness=params["cache_heaviness"](),
+                            cpus=cpus,freq=freq,ht=ht,**u_args)
+                    p_pkg = Hardware.P_PKG(
+                            memory_heaviness=params["memory_heaviness"](),avx_heaviness=params["avx_heaviness"](),compute_heaviness=params["compute_heaviness"](),
+                            IPC=ipc,freq=freq,cpus=cpus,ht=ht,**u_args)
+                    p_core = Hardware.P_Cores(
+                            nomemory_heaviness=params["nomemory_heaviness"](),avx_heaviness=params["avx_heaviness"](),compute_heaviness=params["compute_heaviness"](),
+                            IPC=ipc,freq=freq,cpus=cpus,ht=ht,**u_args)
+                    p_ram = Hardware.P_Ram(memory_heaviness=params["memory_heaviness"](),
+                            IPC=ipc,freq=freq,cpus=cpus,ht=ht,**u_args)
+                    tps = (freq*1000)/(params["ipt"]()/ipc)
+
+                    power = p_pkg + p_ram
+                    epr = power/tps
+
+                    all_configurations.append(Config(freq=freq, cores=cores, ht=True if ht == 1 else False,
+                                                     cpus=cpus, ipc=ipc, power=power, tps=tps, epr=epr,
+                                                     uncore=uncore))
+
+    # Reduce the number of configurations to the pareto optimal ones
+    pareto_configurations = [Config(**pc) for pc in paretoOptimize([c._asdict() for c in all_configurations], ["<power", ">tps"])]
+
+    return build_table(all_configurations, pareto_configurations)
+
+
+class ConfigurationStore:
+    """
+    Cache of the pregenerated configurations of all benchmarks for one hardware
+    model. The store can be shared between several EUF managers which control
+    machines of the same type, so that every benchmark is only evaluated once.
+
+    The configurations are generated in the background by a pool of worker
+    processes. Requested benchmarks are generated in order, but a benchmark
+    which is needed right now can be moved to the front of the queue.
+    """
+    def __init__(self, model=None, max_workers=None):
+        self.model = model if model is not None else hardware_model_name()
+
+        # Reentrant, as done callbacks of already finished jobs run right away
+        # in the submitting thread.
+        self._lock = RLock()
+        self._max_workers = max_workers if max_workers is not None else max(1, (os.cpu_count() or 1) // 2)
+        self._executor = None
+        self._closed = False
+
+        self._pending = []
+        self._running = {}
+        self._logs = {}
+        self._retried = set()
+        self._configurations = {}
+
+    def _create_executor(self):
+        # By now the process already runs other threads (REST server, log
+        # writer), so the workers must not be forked from it directly.
+        method = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+        return ProcessPoolExecutor(max_workers=self._max_workers, mp_context=multiprocessing.get_context(method))
+
+    def _schedule(self):
+        # Only keep as many jobs in flight as we have workers, so that the
+        # order of the pending queue still decides what is generated next.
+        if self._executor is None:
+            self._executor = self._create_executor()
+
+        while self._pending and len(self._running) < self._max_workers:
+            bench_name = self._pending.pop(0)
+
+            try:
+                future = self._executor.submit(generate_configurations, bench_name)
+            except BrokenProcessPool:
+                # A worker process died and took the whole pool with it, so
+                # start over with a new one.
+                self._pending.insert(0, bench_name)
+                self._executor.shutdown(wait=False)
+                self._executor = self._create_executor()
+                continue
+
+            for log in self._logs[bench_name]:
+                log("Generating configurations for {}".format(bench_name))
+
+            self._running[bench_name] = future
+            future.add_done_callback(partial(self._generated, bench_name))
+
+    def _generated(self, bench_name, future):
+        with self._lock:
+            del self._running[bench_name]
+
+            try:
+                configs = future.result()
+            except CancelledError:
+                # The store was shut down
+                self._logs.pop(bench_name, None)
+            except BrokenProcessPool:
+                # Every job in the pool fails if one worker dies, so give the
+                # benchmark another chance before giving up on it.
+                if bench_name not in self._retried and not self._closed:
+                    self._retried.add(bench_name)
+                    self._pending.insert(0, bench_name)
+                else:
+                    for log in self._logs.pop(bench_name):
+                        log("Failed to generate configurations for {}: a worker process died".format(bench_name))
+            except Exception as e:
+                for log in self._logs.pop(bench_name):
+                    log("Failed to generate configurations for {}: {}".format(bench_name, e))
+            else:
+                self._configurations[bench_name] = configs
+                for log in self._logs.pop(bench_name):
+                    log("Generated {} configurations for {}, of which {} are pareto optimal".format(
+                        len(configs), bench_name, len(configs.pareto)))
+
+            if not self._closed:
+                self._schedule()
+
+    def _enqueue(self, bench_name, log, front):
+        if self._closed or bench_name in self._configurations:
+            return
+
+        logs = self._logs.setdefault(bench_name, [])
+        if log is not None and log not in logs:
+            logs.append(log)
+
+        if bench_name in self._running:
+            return
+
+        if bench_name in self._pending:
+            if not front:
+                return
+            self._pending.remove(bench_name)
+
+        if front:
+            self._pending.insert(0, bench_name)
+        else:
+            self._pending.append(bench_name)
+
+        self._schedule()
+
+    def request(self, bench_name, log=None):
+        """
+        Queue the generation of the configurations of a benchmark.
+        """
+        with self._lock:
+            self._enqueue(bench_name, log, front=False)
+
+    def prioritize(self, bench_name, log=None):
+        """
+        Generate the configurations of a benchmark before all other queued ones.
+        """
+        with self._lock:
+            self._enqueue(bench_name, log, front=True)
+
+    def ready(self, bench_name):
+        """
+        Return the configuration table of a benchmark if it is already generated,
+        None otherwise.
+        """
+        with self._lock:
+            return self._configurations.get(bench_name)
+
+    def shutdown(self):
+        with self._lock:
+            executor, self._executor = self._executor, None
+            self._closed = True
+            self._pending = []
+
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,72 @@
+import logging
+from collections import deque
+
+
+class CounterCursor:
+    """
+    Incremental view on an ERIS counter monitor.
+
+    refresh() consumes only the samples which arrived since the last call and
+    keeps the latest ones in a bounded buffer. The monitor itself is never
+    modified. If the monitor hands out a copy of its samples instead of its
+    own list, every refresh still has to copy the whole history, which is
+    logged once.
+    """
+    def __init__(self, monitor, history=64, name=None, log=None):
+        self._monitor = monitor
+        self._name = name
+        self._log = log
+        self._pos = 0
+        self._copied = None
+
+        self._recent = deque(maxlen=history)
+        self.count = 0
+
+    def refresh(self):
+        """
+        Consume the new samples of the monitor and return them.
+        """
+        vals = self._monitor.values(False)
+
+        if self._copied is None:
+            # Find out once whether we get the monitor's own list or a copy
+            self._copied = vals is not self._monitor.values(False)
+            if self._copied and self._log is not None:
+                self._log("Counter {} only provides copies of its samples - every refresh copies "
+                          "its whole history".format(self._name), logging.WARNING)
+
+        if len(vals) < self._pos:
+            # The monitor was reset
+            self._pos = 0
+
+        new = vals[self._pos:]
+        self._recent.extend(new)
+        self.count += len(new)
+        self._pos = len(vals)
+
+        return new
+
+    def latest(self):
+        """
+        The latest sample or None if there is none yet.
+        """
+        if len(self._recent) == 0:
+            return None
+
+        return self._recent[-1]
+
+    def latest_value(self, default=None):
+        sample = self.latest()
+
+        return default if sample is None else sample.value
+
+    def since(self, count):
+        """
+        The samples which arrived after the given sample count, as far as they
+        are still buffered.
+        """
+        n = min(self.count - count, len(self._recent))
+        if n <= 0:
+            return []
+
+        return list(self._recent)[-n:]
@@ -0,0 +1,60 @@
+from collections import namedtuple
+
+
+# What the power budget split needs to know about a node: the power and T/s
+# of its pareto optimal configurations ordered by power (None if it has no
+# modelled configurations yet), its current demand in T/s and its measured
+# power in W (both None if unknown).
+PowerNode = namedtuple("PowerNode", ["steps", "demand", "power"])
+
+
+def distribute_power_budget(nodes, budget):
+    """
+    Split a power budget in W across the given nodes.
+
+    Every node starts with its most frugal configuration and then the node
+    which gains the most T/s per additional watt is upgraded repeatedly. In
+    the first round, nodes are only upgraded until they meet their demand,
+    the second round hands out what is left. Nodes without modelled
+    configurations can't be capped by the models, so their measured power is
+    reserved from the budget instead.
+
+    Returns the power caps of the modelled nodes and the budget which was
+    available to them. If the caps add up to more than that, the budget is
+    below the minimum of the fleet.
+    """
+    available = budget - sum(n.power for n in nodes.values() if n.steps is None and n.power is not None)
+
+    steps = {name: n.steps for name, n in nodes.items() if n.steps}
+    levels = {name: 0 for name in steps}
+
+    spent = sum(s[0][0] for s in steps.values())
+
+    for honor_demand in (True, False):
+        while True:
+            best, best_gain = None, None
+            for name, s in steps.items():
+                level = levels[name]
+                if level + 1 >= len(s):
+                    continue
+
+                (cur_power, cur_tps), (nxt_power, nxt_tps) = s[level], s[level + 1]
+                demand = nodes[name].demand
+                if honor_demand and demand is not None and cur_tps >= demand:
+                    continue
+                if spent - cur_power + nxt_power > available:
+                    continue
+
+                d_power = nxt_power - cur_power
+                gain = (nxt_tps - cur_tps) / d_power if d_power > 0 else float("inf")
+                if best_gain is None or gain > best_gain:
+                    best, best_gain = name, gain
+
+            if best is None:
+                break
+
+            s = steps[best]
+            spent += s[levels[best] + 1][0] - s[levels[best]][0]
+            levels[best] += 1
+
+    return {name: steps[name][levels[name]][0] for name in steps}, available
@@ -0,0 +1,131 @@
+from collections import deque
+
+
+class Forecaster:
+    """
+    Base class of the demand forecasters. Samples are added with update() and
+    predict() estimates the value 'horizon' seconds after the latest sample.
+
+    Every prediction is remembered and scored against the first sample which
+    arrives at or after its target time, which gives the mean absolute
+    percentage error of the forecasts.
+    """
+    def __init__(self, error_weight=0.1):
+        self._error_weight = error_weight
+        self._predictions = deque(maxlen=1000)
+        self._last_timestamp = None
+
+        self.mape = None
+        self.scored = 0
+
+    def _score(self, timestamp, value):
+        while self._predictions and self._predictions[0][0] <= timestamp:
+            _, predicted = self._predictions.popleft()
+            if value == 0:
+                continue
+
+            error = abs(predicted - value) / abs(value)
+            if self.mape is None:
+                self.mape = error
+            else:
+                self.mape = (1 - self._error_weight) * self.mape + self._error_weight * error
+            self.scored += 1
+
+    def update(self, timestamp, value):
+        self._score(timestamp, value)
+        self._update(timestamp, value)
+
+    def predict(self, horizon):
+        value = self._predict(horizon)
+        if value is not None and self._last_timestamp is not None:
+            self._predictions.append((self._last_timestamp + horizon, value))
+
+        return value
+
+    def _update(self, timestamp, value):
+        raise NotImplementedError()
+
+    def _predict(self, horizon):
+        raise NotImplementedError()
+
+
+class HoltForecaster(Forecaster):
+    """
+    Double exponential smoothing (Holt's linear trend method) with the trend
+    kept per second, so that irregular sample intervals are handled.
+    """
+    def __init__(self, alpha=0.5, beta=0.3, **kwargs):
+        super().__init__(**kwargs)
+
+        self._alpha = alpha
+        self._beta = beta
+
+        self._level = None
+        self._trend = 0
+
+    def _update(self, timestamp, value):
+        if self._level is None:
+            self._level = value
+            self._last_timestamp = timestamp
+            return
+
+        dt = timestamp - self._last_timestamp
+        if dt <= 0:
+            return
+
+        last_level = self._level
+        self._level = self._alpha * value + (1 - self._alpha) * (self._level + self._trend * dt)
+        self._trend = self._beta * (self._level - last_level) / dt + (1 - self._beta) * self._trend
+        self._last_timestamp = timestamp
+
+    def _predict(self, horizon):
+        if self._level is None:
+            return None
+
+        return max(0, self._level + self._trend * horizon)
+
+
+class LinearForecaster(Forecaster):
+    """
+    Least squares linear trend over a sliding window of samples.
+    """
+    def __init__(self, window=10, **kwargs):
+        super().__init__(**kwargs)
+
+        self._samples = deque(maxlen=window)
+
+    def _update(self, timestamp, value):
+        self._samples.append((timestamp, value))
+        self._last_timestamp = timestamp
+
+    def _predict(self, horizon):
+        n = len(self._samples)
+        if n == 0:
+            return None
+        if n == 1:
+            return self._samples[0][1]
+
+        t0 = self._samples[0][0]
+        mean_t = sum(t - t0 for t, _ in self._samples) / n
+        mean_v = sum(v for _, v in self._samples) / n
+
+        var_t = sum((t - t0 - mean_t) ** 2 for t, _ in self._samples)
+        if var_t == 0:
+            return mean_v
+
+        slope = sum((t - t0 - mean_t) * (v - mean_v) for t, v in self._samples) / var_t
+        target = self._last_timestamp - t0 + horizon
+
+        return max(0, mean_v + slope * (target - mean_t))
+
+
+def create_forecaster(name):
+    forecasters = {
+        "holt"      : HoltForecaster,
+        "linear"    : LinearForecaster,
+    }
+
+    if name == "none":
+        return None
+
+    return forecasters[name]()
@@ -0,0 +1,151 @@
+import logging
+import time
+from collections import namedtuple
+from datetime import datetime
+from queue import Queue, Full
+from threading import Thread, Lock
+
+
+class LogEntry(namedtuple("LogEntry", ["seq", "timestamp", "level", "message"])):
+    __slots__ = ()
+
+    def __str__(self):
+        return "{} {:<7} {}".format(datetime.fromtimestamp(self.timestamp).strftime("%H:%M:%S"),
+                                    logging.getLevelName(self.level), self.message)
+
+
+class LogRing:
+    """
+    Fixed-capacity ring buffer of leveled log messages.
+
+    Messages logged with the same key are only recorded once per rate limit
+    interval; the number of suppressed repeats is attached to the next recorded
+    one. Messages without a key are always recorded. Output to a stream and/or file happens
+    asynchronously in a separate thread, so logging never blocks the caller.
+    """
+    def __init__(self, capacity=1000, level=logging.INFO, rate_limit=10, stream=None, path=None):
+        self.level = level
+
+        self._capacity = capacity
+        self._rate_limit = rate_limit
+        self._lock = Lock()
+
+        self._entries = [None] * capacity
+        self._seq = 0
+        self._limited = {}
+
+        self._file = open(path, "a") if path is not None else None
+        self._outputs = [o for o in (stream, self._file) if o is not None]
+
+        self._queue = None
+        self._writer = None
+        self.dropped = 0
+        if self._outputs:
+            self._queue = Queue(maxsize=capacity)
+            self._writer = Thread(target=self._write, daemon=True)
+            self._writer.start()
+
+    def _write(self):
+        while True:
+            entry = self._queue.get()
+            if entry is None:
+                break
+
+            for o in self._outputs:
+                o.write(str(entry) + "\n")
+                o.flush()
+
+    def _rate_limited(self, key, now):
+        last, suppressed = self._limited.get(key, (None, 0))
+        if last is not None and now - last < self._rate_limit:
+            self._limited[key] = (last, suppressed + 1)
+            return True, 0
+
+        self._limited[key] = (now, 0)
+
+        # Forget about keys which didn't show up for a while
+        if len(self._limited) > self._capacity:
+            self._limited = {k: v for k, v in self._limited.items() if now - v[0] < self._rate_limit}
+
+        return False, suppressed
+
+    def log(self, message, level=logging.INFO, key=None):
+        if level < self.level:
+            return
+
+        now = time.time()
+
+        with self._lock:
+            limited, suppressed = self._rate_limited(key, now) if key is not None else (False, 0)
+            if limited:
+                return
+
+            if suppressed > 0:
+                message = "{} ({} similar messages suppressed)".format(message, suppressed)
+
+            self._seq += 1
+            entry = LogEntry(self._seq, now, level, message)
+            self._entries[self._seq % self._capacity] = entry
+
+        if self._queue is not None:
+            try:
+                self._queue.put_nowait(entry)
+            except Full:
+                self.dropped += 1
+
+    def tail(self, count, level=logging.NOTSET):
+        """
+        The latest 'count' entries with at least the given level.
+        """
+        # Walk backwards from the newest entry, so that only the requested
+        # entries are touched.
+        with self._lock:
+            last_seq = self._seq
+            oldest = max(last_seq - self._capacity + 1, 1)
+
+            entries = []
+            for seq in range(last_seq, oldest - 1, -1):
+                e = self._entries[seq % self._capacity]
+                if e.level >= level:
+                    entries.append(e)
+                    if len(entries) == count:
+                        break
+
+        entries.reverse()
+        return entries
+
+    def since(self, seq, limit=None, level=logging.NOTSET):
+        """
+        The oldest entries with at least the given level which are newer than
+        the given sequence number and still in the ring, at most 'limit' ones.
+        Returns them together with the sequence number to pass on the next
+        call.
+        """
+        with self._lock:
+            last_seq = self._seq
+            first = max(seq + 1, last_seq - self._capacity + 1, 1)
+
+            entries = []
+            for next_seq in range(first, last_seq + 1):
+                e = self._entries[next_seq % self._capacity]
+                if e.level >= level:
+                    entries.append(e)
+                    if limit is not None and len(entries) == limit:
+                        return entries, next_seq
+
+        return entries, last_seq
+
+    @property
+    def seq(self):
+        with self._lock:
+            return self._seq
+
+    def close(self):
+        if self._writer is not None:
+            self._queue.put(None)
+            self._writer.join()
+            self._writer = None
+
+        if self._file is not None:
+            self._file.close()
+            self._file = None
@@ -0,0 +1,162 @@
+import os
+import re
+import time
+from collections import namedtuple
+from os.path import join, exists
+
+from util.rapl import read_file
+
+
+def parse_cpulist(cpulist):
+    cpus = []
+    for part in cpulist.split(","):
+        part = part.strip()
+        if not part:
+            continue
+
+        if "-" in part:
+            first, last = part.split("-")
+            cpus.extend(range(int(first), int(last) + 1))
+        else:
+            cpus.append(int(part))
+
+    return cpus
+
+
+class CPUTopology:
+    """
+    CPU topology as read from /sys/devices/system/cpu. The base path can point
+    to a fake tree with the same layout.
+    """
+    CPU = namedtuple("CPU", ["id", "package", "core", "node", "llc", "siblings"])
+
+    def __init__(self, base_path="/sys/devices/system/cpu"):
+        self.cpus = {}
+
+        if not exists(base_path):
+            raise ValueError("No CPU topology available")
+
+        for entry in os.scandir(base_path):
+            m = re.fullmatch(r"cpu([0-9]+)", entry.name)
+            if m is None or not exists(join(entry.path, "topology")):
+                continue
+
+            cpu = int(m.group(1))
+            topo = join(entry.path, "topology")
+
+            package = int(read_file(join(topo, "physical_package_id")))
+            core = int(read_file(join(topo, "core_id")))
+            siblings = tuple(parse_cpulist(read_file(join(topo, "thread_siblings_list"))))
+
+            node = 0
+            for e in os.listdir(entry.path):
+                n = re.fullmatch(r"node([0-9]+)", e)
+                if n is not None:
+                    node = int(n.group(1))
+
+            # The last level cache is identified by the lowest CPU in its
+            # shared_cpu_list. Without cache information, assume one per package.
+            llc = ("package", package)
+            cache = join(entry.path, "cache")
+            if exists(cache):
+                indices = sorted(e for e in os.listdir(cache) if re.fullmatch(r"index[0-9]+", e))
+                if indices:
+                    llc = min(parse_cpulist(read_file(join(cache, indices[-1], "shared_cpu_list"))))
+
+            self.cpus[cpu] = CPUTopology.CPU(cpu, package, core, node, llc, siblings)
+
+        if len(self.cpus) == 0:
+            raise ValueError("No CPU topology available")
+
+    def primary(self, cpu):
+        """
+        The first hardware thread of the physical core of the given CPU.
+        """
+        return min(self.cpus[cpu].siblings)
+
+    def cores(self):
+        """
+        The primary hardware threads of all physical cores.
+        """
+        return sorted({self.primary(c) for c in self.cpus})
+
+    def threads(self, cpu):
+        return [s for s in self.cpus[cpu].siblings if s in self.cpus]
+
+
+class Placement:
+    """
+    Chooses on which physical cores the workers run.
+
+    Changes are incremental: when more cores are needed they are added next
+    to the already active ones (same last level cache, then same NUMA node),
+    preferring cores which ran recently and thus still have warm caches. When
+    fewer cores are needed, cores are removed from the least populated cache
+    and node domains first, so that the remaining cores stay packed together.
+    """
+    def __init__(self, topology, cpus=None, clock=time.time):
+        self._topology = topology
+        self._clock = clock
+
+        self._cpus = set(cpus) if cpus is not None else set(topology.cpus)
+        self._cores = [c for c in topology.cores() if c in self._cpus]
+
+        self._active = []
+        self._last_used = {}
+
+    def _domain_counts(self, cores):
+        llcs = {}
+        nodes = {}
+        for c in cores:
+            cpu = self._topology.cpus[c]
+            llcs[cpu.llc] = llcs.get(cpu.llc, 0) + 1
+            nodes[cpu.node] = nodes.get(cpu.node, 0) + 1
+
+        return llcs, nodes
+
+    def _add(self):
+        llcs, nodes = self._domain_counts(self._active)
+        candidates = [c for c in self._cores if c not in self._active]
+
+        def score(c):
+            cpu = self._topology.cpus[c]
+            return (llcs.get(cpu.llc, 0), nodes.get(cpu.node, 0), self._last_used.get(c, 0), -c)
+
+        self._active.append(max(candidates, key=score))
+
+    def _remove(self):
+        llcs, nodes = self._domain_counts(self._active)
+        now = self._clock()
+
+        def score(i):
+            cpu = self._topology.cpus[self._active[i]]
+            # Prefer the least populated domains and the latest added core
+            return (nodes[cpu.node], llcs[cpu.llc], -i)
+
+        i = min(range(len(self._active)), key=score)
+        self._last_used[self._active[i]] = now
+        del self._active[i]
+
+    def select(self, cores, ht):
+        """
+        The CPUs to use for the given number of physical cores.
+        """
+        cores = min(cores, len(self._cores))
+
+        while len(self._active) > cores:
+            self._remove()
+        while len(self._active) < cores:
+            self._add()
+
+        now = self._clock()
+        for c in self._active:
+            self._last_used[c] = now
+
+        cpus = []
+        for c in self._active:
+            if ht:
+                cpus.extend(t for t in self._topology.threads(c) if t in self._cpus)
+            else:
+                cpus.append(c)
+
+        return sorted(cpus)
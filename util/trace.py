@@ -0,0 +1,171 @@
+import mmap
+import os
+import struct
+from enum import IntEnum
+from os.path import exists
+from threading import Lock
+
+
+class TraceError(Exception): pass
+
+
+class Events(IntEnum):
+    SAMPLE      = 0
+    DECISION    = 1
+
+
+# The layout of a single trace record. All records have the same size, so that
+# they can be written with a single pack_into and read back as an array.
+FIELDS = [
+    ("timestamp",       "d"),       # seconds since the epoch
+    ("started",         "d"),       # Tasks.Started
+    ("active",          "d"),       # Tasks.Active
+    ("finished",        "d"),       # Tasks.Finished
+    ("latency",         "d"),       # Tasks.Latency Average
+    ("power",           "d"),       # measured power in W
+    ("est_power",       "d"),       # estimated power of the active configuration in W
+    ("demand",          "d"),       # requested T/s
+    ("est_tps",         "d"),       # estimated T/s of the active configuration
+    ("freq",            "I"),       # core frequency in kHz
+    ("uncore",          "I"),       # uncore frequency in kHz, 0 if not set
+    ("reconfig_us",     "I"),       # duration of the reconfiguration in us
+    ("cores",           "H"),
+    ("ht",              "B"),
+    ("event",           "B"),       # one of Events
+]
+
+RECORD = struct.Struct("<" + "".join(f for _, f in FIELDS))
+
+# File header: magic, version, record size, capacity and number of records
+HEADER = struct.Struct("<8sIIQQ")
+HEADER_SIZE = 64
+MAGIC = b"EUFTRACE"
+VERSION = 1
+
+
+def numpy_dtype():
+    import numpy as np
+
+    return np.dtype([(n, "<" + f) for n, f in FIELDS])
+
+
+class TraceWriter:
+    """
+    Append-only trace of fixed-size binary records in a memory mapped file.
+    When the file is full it is rotated to <path>.1, <path>.2, ... and at most
+    'files' old files are kept. An existing trace is rotated the same way
+    instead of being overwritten.
+    """
+    def __init__(self, path, capacity=65536, files=4):
+        self._path = path
+        self._capacity = capacity
+        self._files = files
+        self._lock = Lock()
+
+        self._file = None
+        self._map = None
+        self._count = 0
+
+        if exists(path) and os.path.getsize(path) > 0:
+            self._shift()
+        self._open()
+
+    def _open(self):
+        size = HEADER_SIZE + self._capacity * RECORD.size
+
+        self._file = open(self._path, "w+b")
+        self._file.truncate(size)
+        self._map = mmap.mmap(self._file.fileno(), size)
+
+        self._count = 0
+        HEADER.pack_into(self._map, 0, MAGIC, VERSION, RECORD.size, self._capacity, 0)
+
+    def _close(self):
+        if self._map is None:
+            return
+
+        self._map.flush()
+        self._map.close()
+        self._file.close()
+
+        self._map = None
+        self._file = None
+
+    def _shift(self):
+        for i in range(self._files, 0, -1):
+            src = self._path if i == 1 else "{}.{}".format(self._path, i - 1)
+            if exists(src):
+                os.replace(src, "{}.{}".format(self._path, i))
+
+    def _rotate(self):
+        self._close()
+        self._shift()
+        self._open()
+
+    def write(self, event, timestamp, started=float("nan"), active=float("nan"), finished=float("nan"),
+              latency=float("nan"), power=float("nan"), est_power=float("nan"), demand=float("nan"),
+              est_tps=float("nan"), freq=0, uncore=0, reconfig_us=0, cores=0, ht=False):
+        with self._lock:
+            if self._map is None:
+                raise TraceError("Trace is already closed")
+
+            if self._count == self._capacity:
+                self._rotate()
+
+            RECORD.pack_into(self._map, HEADER_SIZE + self._count * RECORD.size,
+                             timestamp, started, active, finished, latency, power, est_power, demand,
+                             est_tps, int(freq), int(uncore or 0), int(reconfig_us), int(cores), int(ht),
+                             int(event))
+            self._count += 1
+
+            # The number of records goes last, so readers never see a partial
+            # record.
+            struct.pack_into("<Q", self._map, HEADER.size - 8, self._count)
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, type, value, traceback):
+        self.close()
+
+
+def trace_files(path):
+    """
+    All files of a rotated trace, from the oldest to the newest one.
+    """
+    files = []
+    i = 1
+    while exists("{}.{}".format(path, i)):
+        files.append("{}.{}".format(path, i))
+        i += 1
+
+    files.reverse()
+    if exists(path):
+        files.append(path)
+
+    return files
+
+
+def read_trace(path, chunk=65536):
+    """
+    Stream the records of a (rotated) trace as NumPy structured arrays of at
+    most 'chunk' records each.
+    """
+    import numpy as np
+
+    dtype = numpy_dtype()
+
+    for f in trace_files(path):
+        with open(f, "rb") as fd, mmap.mmap(fd.fileno(), 0, access=mmap.ACCESS_READ) as m:
+            magic, version, record_size, _, count = HEADER.unpack_from(m, 0)
+            if magic != MAGIC or version != VERSION or record_size != dtype.itemsize:
+                raise TraceError("{} is not a compatible trace file".format(f))
+
+            for start in range(0, count, chunk):
+                n = min(chunk, count - start)
+                yield np.frombuffer(m, dtype=dtype, count=n,
+                                    offset=HEADER_SIZE + start * record_size).copy()
@@ -0,0 +1,161 @@
+import os
+import struct
+from glob import glob
+from os.path import join, exists
+
+from util.rapl import read_file
+
+
+def write_file(path, value):
+    with open(path, "w") as f:
+        f.write(str(value))
+
+
+class UncoreError(Exception): pass
+
+
+class UncoreBackend:
+    """
+    Interface for setting the uncore frequency of all packages. Frequencies
+    are given in kHz, like the core frequencies.
+    """
+    def set_frequency(self, khz):
+        raise NotImplementedError()
+
+    def frequency(self):
+        raise NotImplementedError()
+
+
+class SysfsUncore(UncoreBackend):
+    """
+    Uncore frequency control via the intel_uncore_frequency driver.
+    """
+    base_path = "/sys/devices/system/cpu/intel_uncore_frequency"
+
+    def __init__(self, base_path=None):
+        if base_path is not None:
+            self.base_path = base_path
+
+        self._domains = sorted(glob(join(self.base_path, "package_*_die_*")))
+        if len(self._domains) == 0:
+            raise ValueError("No uncore frequency sysfs interface available")
+
+    def set_frequency(self, khz):
+        khz = int(khz)
+
+        try:
+            for d in self._domains:
+                # Order the writes so that min never exceeds max in between.
+                if khz >= int(read_file(join(d, "max_freq_khz"))):
+                    write_file(join(d, "max_freq_khz"), khz)
+                    write_file(join(d, "min_freq_khz"), khz)
+                else:
+                    write_file(join(d, "min_freq_khz"), khz)
+                    write_file(join(d, "max_freq_khz"), khz)
+        except OSError as e:
+            raise UncoreError("Failed to set uncore frequency: {}".format(e))
+
+    def frequency(self):
+        freqs = []
+        for d in self._domains:
+            if exists(join(d, "current_freq_khz")):
+                freqs.append(int(read_file(join(d, "current_freq_khz"))))
+            else:
+                freqs.append(int(read_file(join(d, "max_freq_khz"))))
+
+        return sum(freqs) / len(freqs)
+
+
+class MSRUncore(UncoreBackend):
+    """
+    Uncore frequency control via the UNCORE_RATIO_LIMIT MSR on one CPU of
+    every package. Requires the msr kernel module.
+    """
+    UNCORE_RATIO_LIMIT = 0x620
+    UNCORE_PERF_STATUS = 0x621
+
+    def __init__(self, cpu_path="/sys/devices/system/cpu", msr_path="/dev/cpu"):
+        self._msr_path = msr_path
+
+        packages = {}
+        for topo in glob(join(cpu_path, "cpu[0-9]*", "topology", "physical_package_id")):
+            cpu = int(topo.split(os.sep)[-3][len("cpu"):])
+            pkg = int(read_file(topo))
+
+            if pkg not in packages or cpu < packages[pkg]:
+                packages[pkg] = cpu
+
+        self._cpus = sorted(packages.values())
+        if len(self._cpus) == 0 or not exists(join(msr_path, str(self._cpus[0]), "msr")):
+            raise ValueError("No MSR interface available")
+
+    def _read_msr(self, cpu, msr):
+        with open(join(self._msr_path, str(cpu), "msr"), "rb") as f:
+            f.seek(msr)
+            return struct.unpack("<Q", f.read(8))[0]
+
+    def _write_msr(self, cpu, msr, value):
+        with open(join(self._msr_path, str(cpu), "msr"), "wb") as f:
+            f.seek(msr)
+            f.write(struct.pack("<Q", value))
+
+    def set_frequency(self, khz):
+        # The ratios are given in multiples of 100 MHz
+        ratio = int(khz / 100000) & 0x7f
+
+        try:
+            for cpu in self._cpus:
+                value = self._read_msr(cpu, self.UNCORE_RATIO_LIMIT)
+                value = (value & ~0x7f7f) | (ratio << 8) | ratio
+                self._write_msr(cpu, self.UNCORE_RATIO_LIMIT, value)
+        except OSError as e:
+            raise UncoreError("Failed to set uncore frequency: {}".format(e))
+
+    def frequency(self):
+        ratios = [self._read_msr(cpu, self.UNCORE_PERF_STATUS) & 0x7f for cpu in self._cpus]
+
+        return sum(ratios) / len(ratios) * 100000
+
+
+class FakeUncore(UncoreBackend):
+    """
+    Backend which only remembers the set frequency. Used for testing and on
+    machines without uncore frequency control.
+    """
+    def __init__(self, khz=None):
+        self._khz = khz
+        self.history = []
+
+    def set_frequency(self, khz):
+        self._khz = khz
+        self.history.append(khz)
+
+    def frequency(self):
+        return self._khz
+
+
+def create_uncore_backend(name="auto"):
+    """
+    Create the uncore backend with the given name. With "auto" the first
+    available hardware backend is used. Returns None if no backend should or
+    can be used.
+    """
+    backends = {
+        "sysfs" : SysfsUncore,
+        "msr"   : MSRUncore,
+        "fake"  : FakeUncore,
+    }
+
+    if name == "none":
+        return None
+
+    if name == "auto":
+        for b in (SysfsUncore, MSRUncore):
+            try:
+                return b()
+            except (ValueError, OSError):
+                pass
+
+        return None
+
+    return backends[name]()